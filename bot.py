@@ -1,8 +1,11 @@
 import discord
+from discord import app_commands
 from discord.ext import commands
 import os
 import json
+import sqlite3
 from dotenv import load_dotenv
+from utils.jobs import JobQueue
 
 # --- NEW IMPORTS FOR KEEP_ALIVE ---
 from flask import Flask
@@ -34,15 +37,20 @@ def keep_alive():
 # -----------------------------------------
 
 # --- Bot Initialization ---
-class GuildBot(commands.Bot):
-    def __init__(self):
-        super().__init__(
-            command_prefix="!",
-            intents=discord.Intents.all(),
-        )
-        self.config = config
+class GuildBotMixin:
+    """Startup logic shared by the single-process bot and the sharded bot."""
+
+    def owns_first_shard(self) -> bool:
+        # Only one process should sync the command tree, otherwise every worker
+        # would hit the same global rate limit on startup.
+        shard_ids = getattr(self, "shard_ids", None)
+        return shard_ids is None or 0 in shard_ids
 
     async def setup_hook(self):
+        self.jobs = JobQueue(workers=self.config.get("job_workers", 4))
+        self.jobs.start()
+        self.tree.on_error = self.on_app_command_error
+
         print("--- Loading Cogs ---")
         for filename in os.listdir('./cogs'):
             if filename.endswith('.py'):
@@ -52,17 +60,58 @@ class GuildBot(commands.Bot):
                 except Exception as e:
                     print(f"  [!] Failed to load {filename}: {e}")
         
-        await self.tree.sync()
-        print("--- Command tree synced ---")
+        if self.owns_first_shard():
+            await self.tree.sync()
+            print("--- Command tree synced ---")
+
+    async def on_app_command_error(self, interaction: discord.Interaction, error: app_commands.AppCommandError):
+        # The shared store gives up quickly when another shard process holds its lock; tell the user to retry.
+        if isinstance(getattr(error, "original", error), sqlite3.OperationalError):
+            message = "⚠️ The bot's database is busy right now, please try again in a moment."
+            if interaction.response.is_done():
+                return await interaction.followup.send(message, ephemeral=True)
+            return await interaction.response.send_message(message, ephemeral=True)
+        await app_commands.CommandTree.on_error(self.tree, interaction, error)
+
+    async def close(self):
+        if hasattr(self, "jobs"):
+            await self.jobs.stop()
+        await super().close()
 
     async def on_ready(self):
         print(f"\n--- Bot is online and ready! ---")
         print(f"Logged in as: {self.user}")
         print(f"Bot ID: {self.user.id}")
+        if isinstance(self, commands.AutoShardedBot):
+            print(f"Shards: {sorted(self.shards)} of {self.shard_count}")
         print("---------------------------------")
 
+class GuildBot(GuildBotMixin, commands.Bot):
+    def __init__(self):
+        super().__init__(
+            command_prefix="!",
+            intents=discord.Intents.all(),
+        )
+        self.config = config
+
+class ShardedGuildBot(GuildBotMixin, commands.AutoShardedBot):
+    """AutoShardedBot mode. With no arguments it runs every shard in this process;
+    the launcher passes a subset of shard_ids to each worker process."""
+
+    def __init__(self, shard_ids: list = None, shard_count: int = None):
+        super().__init__(
+            command_prefix="!",
+            intents=discord.Intents.all(),
+            shard_ids=shard_ids,
+            shard_count=shard_count,
+        )
+        self.config = config
+
 # --- Run the Bot ---
 if __name__ == "__main__":
-    bot = GuildBot()
+    if config.get("sharded"):
+        bot = ShardedGuildBot(shard_count=config.get("shard_count"))
+    else:
+        bot = GuildBot()
     keep_alive() # <-- ADDED THIS LINE TO START THE WEB SERVER
     bot.run(TOKEN)
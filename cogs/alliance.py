@@ -2,8 +2,14 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 from .general import log_event
+from utils.jobs import PRIORITY_LOW, notify_interaction
+from utils.export import EXPORT_FORMATS, GzipExportWriter, send_export
+import asyncio
 import datetime
 
+ROSTER_EXPORT_FIELDS = ["alliance", "guild_role_id", "leader_id", "member_id", "member_name", "display_name", "is_leader"]
+ROSTER_EXPORT_BATCH = 1000 # Members copied and written per worker-thread hop.
+
 class Alliance(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
@@ -52,12 +58,16 @@ class Alliance(commands.Cog):
         ally_leader_role = await self.get_role(interaction.guild, self.config["ally_leader_role_id"])
         dark_ally_role = await self.get_role(interaction.guild, self.config["dark_ally_role_id"])
         
-        member_count = len(guild_role.members)
-        for member in list(guild_role.members):
+        members = list(guild_role.members)
+        await interaction.followup.send(f"🕒 Disbanding `{guild_role.name}`: removing roles from {len(members)} members in the background...")
+        self.bot.jobs.submit(f"remove-guild: {guild_role.name}", self.disband_guild(interaction, guild_role, members, ally_leader_role, dark_ally_role), on_error=notify_interaction(interaction, "Disbanding the alliance"))
+
+    async def disband_guild(self, interaction: discord.Interaction, guild_role: discord.Role, members: list, ally_leader_role: discord.Role, dark_ally_role: discord.Role):
+        for member in members:
             await member.remove_roles(guild_role, ally_leader_role, dark_ally_role, reason="Alliance disbanded")
         
         await guild_role.delete(reason=f"Alliance disbanded by {interaction.user}")
-        embed = discord.Embed(title="🗑️ Alliance Disbanded", description=f"The alliance with `{guild_role.name}` has been dissolved. Roles removed from {member_count} members.", color=discord.Color.red())
+        embed = discord.Embed(title="🗑️ Alliance Disbanded", description=f"The alliance with `{guild_role.name}` has been dissolved. Roles removed from {len(members)} members.", color=discord.Color.red())
         await interaction.followup.send(embed=embed)
         log_event("ALLIANCE_GUILD_REMOVE", interaction.user, {"guild_name": guild_role.name})
 
@@ -154,6 +164,63 @@ class Alliance(commands.Cog):
         
         await interaction.followup.send(embed=embed)
 
+    # --- EXPORTS ---
+    @app_commands.command(name="export-roster", description="[ADMIN] Download every allied guild and solo ally as a compressed file.")
+    @app_commands.describe(file_format="csv or jsonl.")
+    async def export_roster(self, interaction: discord.Interaction, file_format: str = "csv"):
+        if not self.is_admin(interaction): return await interaction.response.send_message("Permission denied.", ephemeral=True)
+        file_format = file_format.lower()
+        if file_format not in EXPORT_FORMATS: return await interaction.response.send_message(f"Format must be one of: {', '.join(EXPORT_FORMATS)}.", ephemeral=True)
+        await interaction.response.defer(ephemeral=True)
+        self.bot.jobs.submit("export-roster", self.send_roster_export(interaction, file_format), priority=PRIORITY_LOW, on_error=notify_interaction(interaction, "The roster export"))
+
+    async def send_roster_export(self, interaction: discord.Interaction, file_format: str):
+        ally_leader_role = await self.get_role(interaction.guild, self.config["ally_leader_role_id"])
+        solo_ally_role = await self.get_role(interaction.guild, self.config["solo_ally_role_id"])
+
+        # Allied guild role id -> (guild name, leader id), worked out once up front.
+        allied_guilds = {}
+        for leader in ally_leader_role.members:
+            guild_role = await self.get_leader_guild_role(leader)
+            if guild_role: allied_guilds[guild_role.id] = (guild_role.name, leader.id)
+
+        # discord.py objects are only safe to read on the event loop, so each batch of members
+        # is copied to plain values here and only that batch is formatted and compressed in
+        # a worker thread. At most one batch of copies is alive at a time.
+        wanted_ids = set(allied_guilds) | {solo_ally_role.id}
+        members = interaction.guild.members
+        writer = GzipExportWriter(ROSTER_EXPORT_FIELDS, file_format)
+        try:
+            for start in range(0, len(members), ROSTER_EXPORT_BATCH):
+                allies = []
+                for member in members[start:start + ROSTER_EXPORT_BATCH]:
+                    role_ids = [role.id for role in member.roles if role.id in wanted_ids]
+                    if role_ids: allies.append((member.id, member.name, member.display_name, role_ids))
+                await asyncio.to_thread(writer.write_rows, self.roster_rows(allies, allied_guilds, solo_ally_role.id))
+            buffer, count = await asyncio.to_thread(writer.finish)
+        except BaseException:
+            writer.abort()
+            raise
+        await send_export(interaction, buffer, count, f"roster-{datetime.date.today().isoformat()}.{file_format}.gz")
+
+    def roster_rows(self, allies: list, allied_guilds: dict, solo_ally_role_id: int):
+        """Yields one row per (member, allied guild) plus one per solo ally from the plain-value snapshot."""
+        for member_id, member_name, display_name, role_ids in allies:
+            for role_id in role_ids:
+                if role_id in allied_guilds:
+                    guild_name, leader_id = allied_guilds[role_id]
+                    yield {
+                        "alliance": guild_name, "guild_role_id": role_id, "leader_id": leader_id,
+                        "member_id": member_id, "member_name": member_name, "display_name": display_name,
+                        "is_leader": member_id == leader_id
+                    }
+                elif role_id == solo_ally_role_id:
+                    yield {
+                        "alliance": "Solo Ally", "guild_role_id": None, "leader_id": None,
+                        "member_id": member_id, "member_name": member_name, "display_name": display_name,
+                        "is_leader": False
+                    }
+
 
 async def setup(bot: commands.Bot):
     await bot.add_cog(Alliance(bot))
\ No newline at end of file
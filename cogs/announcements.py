@@ -0,0 +1,151 @@
+import discord
+from discord import app_commands
+from discord.ext import commands
+import asyncio
+import datetime
+import heapq
+import time
+from .general import log_event
+from utils.state_store import get_store
+from utils.jobs import PRIORITY_HIGH
+from utils.announcements import build_announcement_embed, fan_out, parse_channel_ids
+
+# --- ANNOUNCEMENT SCHEDULER ---
+# Pending announcements live in the shared store, so they survive restarts.
+# One dispatcher task keeps a heap of (due_at, id) and sleeps until the
+# earliest one is due, instead of one sleeping task per announcement. It
+# reloads the heap every RESYNC_SECONDS to pick up announcements scheduled
+# from other shard processes.
+RESYNC_SECONDS = 60
+RETRY_SECONDS = 5 # How soon to retry a resync that failed (e.g. the store was busy).
+
+class Announcements(commands.Cog):
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+        self.config = bot.config
+        self.heap = []
+        self.wake = asyncio.Event()
+        self.dispatcher = None
+
+    async def cog_load(self):
+        # Only one process dispatches; the store's claim step guards against doubles anyway.
+        if self.bot.owns_first_shard():
+            self.dispatcher = asyncio.create_task(self.dispatch_loop())
+
+    async def cog_unload(self):
+        if self.dispatcher:
+            self.dispatcher.cancel()
+
+    def is_admin(self, interaction: discord.Interaction) -> bool:
+        admin_ids = set(self.config["admin_role_ids"])
+        user_role_ids = {role.id for role in interaction.user.roles}
+        return not admin_ids.isdisjoint(user_role_ids)
+
+    # --- DISPATCHER ---
+    def reload_heap(self):
+        self.heap = [(a["due_at"], a["id"]) for a in get_store().list_announcements()]
+        heapq.heapify(self.heap)
+
+    async def dispatch_loop(self):
+        await self.bot.wait_until_ready()
+        last_sync = 0
+        while True:
+            now = time.time()
+            if now - last_sync >= RESYNC_SECONDS:
+                try:
+                    self.reload_heap()
+                    last_sync = now
+                except Exception as e:
+                    # Keep dispatching from the current heap and try the resync again shortly.
+                    print(f"  [!] Could not reload scheduled announcements: {e}")
+                    last_sync = now - RESYNC_SECONDS + RETRY_SECONDS
+
+            while self.heap and self.heap[0][0] <= now:
+                due_at, announcement_id = heapq.heappop(self.heap)
+                try:
+                    announcement = get_store().claim_announcement(announcement_id, due_at, now)
+                except Exception as e:
+                    # Leave it in the store; the next resync puts it back on the heap.
+                    print(f"  [!] Could not claim announcement #{announcement_id}: {e}")
+                    continue
+                if announcement is None: continue # Cancelled, rescheduled, or claimed by another process.
+                if announcement["next_due_at"]:
+                    heapq.heappush(self.heap, (announcement["next_due_at"], announcement_id))
+                self.bot.jobs.submit(f"announcement: {announcement['title']}", self.deliver(announcement), priority=PRIORITY_HIGH)
+
+            timeout = RESYNC_SECONDS - (now - last_sync)
+            if self.heap: timeout = min(timeout, self.heap[0][0] - now)
+            self.wake.clear()
+            try:
+                await asyncio.wait_for(self.wake.wait(), timeout=max(timeout, 0))
+            except asyncio.TimeoutError:
+                pass
+
+    async def deliver(self, announcement: dict):
+        embed = build_announcement_embed(announcement["title"], announcement["message"], f"Scheduled by {announcement['created_by_name']}")
+        mention = f"<@&{announcement['mention_role_id']}>" if announcement["mention_role_id"] else None
+        results = await fan_out(self.bot, announcement["channel_ids"], mention, embed)
+        for channel_id, error in results:
+            details = {"id": announcement["id"], "title": announcement["title"], "channel_id": channel_id, "scheduled_by": announcement["created_by_name"]}
+            if error: details["error"] = error
+            log_event("ANNOUNCEMENT_FAILED" if error else "ANNOUNCEMENT_DELIVERED", self.bot.user, details)
+
+    # --- COMMANDS ---
+    @app_commands.command(name="announce-schedule", description="[ADMIN] Schedule a one-off or recurring announcement.")
+    @app_commands.describe(
+        title="The title of the announcement.",
+        message="The main content (use '\\n' for new lines).",
+        in_minutes="Minutes from now until the first post.",
+        at_utc="Or an exact UTC time for the first post, as YYYY-MM-DD HH:MM.",
+        repeat_hours="Repeat every this many hours (0 for a one-off).",
+        channels="Channels to post in (mention them). Defaults to the announcement channel."
+    )
+    async def announce_schedule(self, interaction: discord.Interaction, title: str, message: str, in_minutes: int = 0, at_utc: str = None, repeat_hours: int = 0, channels: str = None):
+        if not self.is_admin(interaction): return await interaction.response.send_message("Permission denied.", ephemeral=True)
+
+        if at_utc:
+            try:
+                due = datetime.datetime.strptime(at_utc, "%Y-%m-%d %H:%M").replace(tzinfo=datetime.timezone.utc)
+            except ValueError:
+                return await interaction.response.send_message("Invalid time. Use `YYYY-MM-DD HH:MM` in UTC.", ephemeral=True)
+        else:
+            due = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(minutes=max(in_minutes, 0))
+        if repeat_hours < 0: return await interaction.response.send_message("`repeat_hours` cannot be negative.", ephemeral=True)
+
+        channel_ids = parse_channel_ids(channels) or [self.config["announcement_channel_id"]]
+        announcement_id = get_store().add_announcement(
+            due_at=due.timestamp(), interval_seconds=repeat_hours * 3600 or None, title=title, message=message,
+            channel_ids=channel_ids, mention_role_id=self.config["guild_member_role_id"],
+            created_by_id=interaction.user.id, created_by_name=interaction.user.name
+        )
+        heapq.heappush(self.heap, (due.timestamp(), announcement_id))
+        self.wake.set()
+
+        repeat_text = f", repeating every {repeat_hours}h" if repeat_hours else ""
+        await interaction.response.send_message(f"🗓️ Announcement `#{announcement_id}` scheduled for <t:{int(due.timestamp())}:F>{repeat_text} in {len(channel_ids)} channel(s).", ephemeral=True)
+        log_event("ANNOUNCEMENT_SCHEDULED", interaction.user, {"id": announcement_id, "title": title, "repeat_hours": repeat_hours})
+
+    @app_commands.command(name="announce-list", description="[ADMIN] List scheduled announcements.")
+    async def announce_list(self, interaction: discord.Interaction):
+        if not self.is_admin(interaction): return await interaction.response.send_message("Permission denied.", ephemeral=True)
+        announcements = get_store().list_announcements()
+        if not announcements: return await interaction.response.send_message("No announcements are scheduled.", ephemeral=True)
+
+        embed = discord.Embed(title="🗓️ Scheduled Announcements", color=discord.Color.gold())
+        for a in announcements[:25]:
+            repeat_text = f"Every {a['interval_seconds'] // 3600}h" if a["interval_seconds"] else "One-off"
+            channels_text = " ".join(f"<#{c}>" for c in a["channel_ids"])
+            embed.add_field(name=f"#{a['id']} • {a['title'][:200]}", value=f"Next: <t:{int(a['due_at'])}:R> • {repeat_text} • by {a['created_by_name']}\n{channels_text}"[:1024], inline=False)
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+    @app_commands.command(name="announce-cancel", description="[ADMIN] Cancel a scheduled announcement.")
+    @app_commands.describe(announcement_id="The number shown by /announce-list.")
+    async def announce_cancel(self, interaction: discord.Interaction, announcement_id: int):
+        if not self.is_admin(interaction): return await interaction.response.send_message("Permission denied.", ephemeral=True)
+        # The heap entry is left behind; the dispatcher skips it when the claim finds no row.
+        if not get_store().cancel_announcement(announcement_id): return await interaction.response.send_message(f"No scheduled announcement `#{announcement_id}`.", ephemeral=True)
+        await interaction.response.send_message(f"🗑️ Announcement `#{announcement_id}` cancelled.", ephemeral=True)
+        log_event("ANNOUNCEMENT_CANCELLED", interaction.user, {"id": announcement_id})
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(Announcements(bot))
@@ -3,6 +3,7 @@ from discord import app_commands
 from discord.ext import commands
 import datetime
 from .general import log_event # نستدعي دالة التسجيل من الملف العام
+from utils.jobs import PRIORITY_URGENT, notify_interaction
 
 class Gank(commands.Cog):
     def __init__(self, bot: commands.Bot):
@@ -18,7 +19,10 @@ class Gank(commands.Cog):
     async def gank_ping(self, interaction: discord.Interaction, enemy_guild: str, server_name: str):
         
         await interaction.response.send_message("Your gank ping is being prepared...", ephemeral=True)
+        # The actual pinging runs on the job queue with top priority, so the command returns immediately.
+        self.bot.jobs.submit(f"gank-ping: {enemy_guild}", self.send_gank_ping(interaction, enemy_guild, server_name), priority=PRIORITY_URGENT, on_error=notify_interaction(interaction, "The gank ping"))
 
+    async def send_gank_ping(self, interaction: discord.Interaction, enemy_guild: str, server_name: str):
         # Get the dedicated channel for pings
         ping_channel = self.bot.get_channel(self.config["gank_ping_channel_id"])
         if not ping_channel:
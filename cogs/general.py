@@ -1,23 +1,18 @@
 import discord
 from discord import app_commands
 from discord.ext import commands
+import asyncio
 import datetime
-import json
-import os
+import sqlite3
+from utils.state_store import get_store, iter_audit_rows, open_reader
+from utils.jobs import PRIORITY_LOW, PRIORITY_NAMES, notify_interaction
+from utils.export import EXPORT_FORMATS, send_export, write_gzip_export
+from utils.announcements import build_announcement_embed, fan_out, parse_channel_ids
 
-LOG_FILE = 'data/audit_log.json'
+AUDIT_EXPORT_FIELDS = ["timestamp", "event_type", "user_id", "user_name", "details"]
 
 def log_event(event_type: str, user: discord.Member, details: dict):
-    """A centralized function to log events to a JSON file."""
-    if not os.path.exists(LOG_FILE) or os.path.getsize(LOG_FILE) == 0:
-        logs = []
-    else:
-        with open(LOG_FILE, 'r', encoding='utf-8') as f:
-            try:
-                logs = json.load(f)
-            except json.JSONDecodeError:
-                logs = [] # If file is corrupted or empty
-
+    """A centralized function to log events to the shared state store."""
     log_entry = {
         "event_type": event_type,
         "user_id": user.id,
@@ -25,10 +20,19 @@ def log_event(event_type: str, user: discord.Member, details: dict):
         "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
         "details": details
     }
-    logs.insert(0, log_entry)
-    
-    with open(LOG_FILE, 'w', encoding='utf-8') as f:
-        json.dump(logs, f, indent=4, ensure_ascii=False)
+    try:
+        get_store().append_audit(log_entry)
+    except sqlite3.OperationalError as e:
+        # Another shard process held the lock too long; don't fail the command over an audit entry.
+        print(f"  [!] Could not log {event_type} event: {e}")
+
+def export_audit_log(event_type: str, file_format: str):
+    """Streams the audit log into a gzip buffer. Runs in a worker thread, so it uses its own read-only connection."""
+    conn = open_reader()
+    try:
+        return write_gzip_export(iter_audit_rows(conn, event_type), AUDIT_EXPORT_FIELDS, file_format)
+    finally:
+        conn.close()
 
 
 class General(commands.Cog):
@@ -42,21 +46,29 @@ class General(commands.Cog):
         return not admin_ids.isdisjoint(user_role_ids)
 
     @app_commands.command(name="announce", description="[ADMIN] Post a formatted announcement.")
-    @app_commands.describe(title="The title of the announcement.", message="The main content (use '\\n' for new lines).")
-    async def announce(self, interaction: discord.Interaction, title: str, message: str):
+    @app_commands.describe(
+        title="The title of the announcement.",
+        message="The main content (use '\\n' for new lines).",
+        channels="Optional: Channels to post in (mention them). Defaults to the announcement channel."
+    )
+    async def announce(self, interaction: discord.Interaction, title: str, message: str, channels: str = None):
         if not self.is_admin(interaction): return await interaction.response.send_message("Permission denied.", ephemeral=True)
         
         await interaction.response.defer(ephemeral=True)
-        target_channel = self.bot.get_channel(self.config["announcement_channel_id"])
+        channel_ids = parse_channel_ids(channels) or [self.config["announcement_channel_id"]]
         mention_role = interaction.guild.get_role(self.config["guild_member_role_id"])
-        if not target_channel or not mention_role: return await interaction.followup.send("Error: Could not find announcement channel or role.")
+        if not mention_role: return await interaction.followup.send("Error: Could not find announcement channel or role.")
         
-        embed = discord.Embed(title=f"📣 {title}", description=message.replace("\\n", "\n"), color=discord.Color.gold(), timestamp=datetime.datetime.now())
-        embed.set_footer(text=f"Announcement by {interaction.user.display_name}", icon_url=interaction.user.display_avatar)
+        embed = build_announcement_embed(title, message, f"Announcement by {interaction.user.display_name}", icon_url=interaction.user.display_avatar)
         
-        await target_channel.send(content=mention_role.mention, embed=embed)
-        await interaction.followup.send("✅ Announcement has been posted successfully!")
-        log_event("ANNOUNCEMENT", interaction.user, {"title": title})
+        results = await fan_out(self.bot, channel_ids, mention_role.mention, embed)
+        failed = [channel_id for channel_id, error in results if error]
+        if len(failed) == len(channel_ids): return await interaction.followup.send("Error: Could not post the announcement in any channel.")
+        if failed:
+            await interaction.followup.send(f"⚠️ Posted in {len(channel_ids) - len(failed)} channel(s), but failed in: {' '.join(f'<#{c}>' for c in failed)}")
+        else:
+            await interaction.followup.send("✅ Announcement has been posted successfully!")
+        log_event("ANNOUNCEMENT", interaction.user, {"title": title, "channels": len(channel_ids) - len(failed)})
 
     @app_commands.command(name="view-logs", description="[ADMIN] View the recent activity logs.")
     @app_commands.describe(event_type="Optional: Filter by event type (e.g., PROMOTION).")
@@ -64,16 +76,9 @@ class General(commands.Cog):
         if not self.is_admin(interaction): return await interaction.response.send_message("Permission denied.", ephemeral=True)
         await interaction.response.defer(ephemeral=True)
 
-        if not os.path.exists(LOG_FILE) or os.path.getsize(LOG_FILE) == 0:
-            return await interaction.followup.send("Log file is empty.")
-
-        with open(LOG_FILE, 'r', encoding='utf-8') as f:
-            logs = json.load(f)
-
-        if event_type:
-            logs = [log for log in logs if log['event_type'].lower() == event_type.lower()]
-
+        logs = list(get_store().iter_audit(event_type=event_type, limit=10))
         if not logs:
+            if not event_type: return await interaction.followup.send("Log file is empty.")
             return await interaction.followup.send(f"No logs found for event type: `{event_type}`.")
 
         embed = discord.Embed(title="📜 Audit Log", description="Showing the last 10 entries.", color=discord.Color.light_grey())
@@ -87,16 +92,74 @@ class General(commands.Cog):
             
         await interaction.followup.send(embed=embed)
 
+    @app_commands.command(name="audit-stats", description="[ADMIN] Summarise the audit log from precomputed counts.")
+    @app_commands.describe(
+        group_by="What to count by: event_type, user, day, or a details key such as enemy_guild.",
+        event_type="Optional: Only count this event type (e.g., GANK_PING).",
+        days="How many days back to count (0 for all time)."
+    )
+    async def audit_stats(self, interaction: discord.Interaction, group_by: str = "event_type", event_type: str = None, days: int = 7):
+        if not self.is_admin(interaction): return await interaction.response.send_message("Permission denied.", ephemeral=True)
+        await interaction.response.defer(ephemeral=True)
+
+        since_day = None
+        if days > 0:
+            since_day = (datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(days=days - 1)).date().isoformat()
+        rows = get_store().audit_stats(group_by, event_type=event_type, since_day=since_day)
+        if not rows:
+            return await interaction.followup.send("No matching events found.")
+
+        period = f"last {days} days" if days > 0 else "all time"
+        lines = [f"{f'<@{label}>' if group_by == 'user' else f'`{label}`'} — **{count}**" for label, count in rows]
+        embed = discord.Embed(
+            title="📊 Audit Stats",
+            description=f"**{event_type or 'All events'}** grouped by `{group_by}` ({period}).\n\n" + "\n".join(lines),
+            color=discord.Color.light_grey()
+        )
+        await interaction.followup.send(embed=embed)
+
+    @app_commands.command(name="export-audit", description="[ADMIN] Download the full audit log as a compressed file.")
+    @app_commands.describe(file_format="csv or jsonl.", event_type="Optional: Only export this event type (e.g., GANK_PING).")
+    async def export_audit(self, interaction: discord.Interaction, file_format: str = "csv", event_type: str = None):
+        if not self.is_admin(interaction): return await interaction.response.send_message("Permission denied.", ephemeral=True)
+        file_format = file_format.lower()
+        if file_format not in EXPORT_FORMATS: return await interaction.response.send_message(f"Format must be one of: {', '.join(EXPORT_FORMATS)}.", ephemeral=True)
+        await interaction.response.defer(ephemeral=True)
+        self.bot.jobs.submit("export-audit", self.send_audit_export(interaction, file_format, event_type), priority=PRIORITY_LOW, on_error=notify_interaction(interaction, "The audit export"))
+
+    async def send_audit_export(self, interaction: discord.Interaction, file_format: str, event_type: str):
+        buffer, count = await asyncio.to_thread(export_audit_log, event_type, file_format)
+        filename = f"audit-{(event_type or 'all').lower()}-{datetime.date.today().isoformat()}.{file_format}.gz"
+        await send_export(interaction, buffer, count, filename)
+
+    @app_commands.command(name="jobs", description="[ADMIN] Show queued, running and recently finished background jobs.")
+    async def jobs(self, interaction: discord.Interaction):
+        if not self.is_admin(interaction): return await interaction.response.send_message("Permission denied.", ephemeral=True)
+        queue = self.bot.jobs
+
+        running = [f"`{job.name}` ({PRIORITY_NAMES[job.priority]}) — running {job.run_time:.1f}s" for job in queue.running()]
+        queued = [f"`{job.name}` ({PRIORITY_NAMES[job.priority]}) — waiting {job.wait_time:.1f}s" for job in queue.queued()]
+        finished = [
+            f"{'✅' if job.state == 'done' else '❌'} `{job.name}` — waited {job.wait_time:.1f}s, ran {job.run_time:.1f}s"
+            for job in list(queue.finished)[:10]
+        ]
+
+        embed = discord.Embed(title="⚙️ Background Jobs", description=f"{queue.worker_count} workers + 1 urgent worker", color=discord.Color.light_grey())
+        embed.add_field(name=f"▶️ Running ({len(running)})", value="\n".join(running[:10]) or "Nothing running.", inline=False)
+        embed.add_field(name=f"🕒 Queued ({len(queued)})", value="\n".join(queued[:10]) or "Queue is empty.", inline=False)
+        embed.add_field(name="📋 Recently Finished", value="\n".join(finished) or "No jobs yet.", inline=False)
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
     @app_commands.command(name="help", description="Shows a list of all available bot commands.")
     async def help(self, interaction: discord.Interaction):
         await interaction.response.defer(ephemeral=True)
         embed = discord.Embed(title="🤖 Bot Commands Guide", color=discord.Color.purple())
         
         # Updated help text
-        admin_commands = "`/announce`, `/promote`, `/demote`, `/view-logs`"
+        admin_commands = "`/announce`, `/announce-schedule`, `/announce-list`, `/announce-cancel`, `/promote`, `/demote`, `/view-logs`, `/audit-stats`, `/export-audit`, `/export-roster`, `/jobs`"
         gank_commands = "`/gank-ping`: Calls available members to a war."
         alliance_commands = "`/admin-add-guild`, `/admin-remove-guild`, `/admin-add-solo-ally`, `/admin-remove-solo-ally`, `/ally-add-member`, `/ally-remove-member`, `/view-ally-guild`"
-        tournament_commands = "`/solo-tournament-start`, `/tournament-winner`, `/tournament-status`, `/tournament-end`"
+        tournament_commands = "`/solo-tournament-start`, `/tournament-winner`, `/tournament-status`, `/tournament-end`, `/player-stats`, `/tournament-history`"
         public_commands = "`/alliance-leaderboard`, `/help`"
     
         embed.add_field(name="👑 Admin Commands", value=admin_commands, inline=False)
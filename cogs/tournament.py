@@ -1,38 +1,126 @@
 import discord
 from discord import app_commands
 from discord.ext import commands
-import json
-import os
 import random
+import datetime
+import copy
 from typing import List, Dict
 from .general import log_event # We import the logger from our general cog
+from utils.state_store import get_store
+from utils.matchmaking import balance_teams, fight_card, fight_counts, past_pairs, rank_seed
+from utils.jobs import PRIORITY_HIGH, notify_interaction
 
-# --- DATA FILE HELPER FUNCTIONS ---
-TOURNAMENT_FILE = 'data/tournament_data.json'
+# --- DATA HELPER FUNCTIONS ---
+# Tournament state lives in the shared state store so every shard process sees the same bracket.
+# Each change is appended to a write-ahead journal as a small mutation; the full
+# state is only rewritten when the journal is compacted into a new snapshot.
+TOURNAMENT_KEY = 'tournament'
+SNAPSHOT_EVERY = 50 # Journal entries to keep before compacting them into a snapshot.
 
-def load_data() -> Dict:
-    """Loads tournament data from the JSON file."""
-    if not os.path.exists(TOURNAMENT_FILE) or os.path.getsize(TOURNAMENT_FILE) == 0:
+def apply_mutation(t_data: Dict, op: str, payload: Dict) -> Dict:
+    """Applies one journaled mutation to the tournament state. Used both live and on replay."""
+    if op == "start":
+        return payload["state"]
+    if op == "end":
         return {"is_active": False}
-    with open(TOURNAMENT_FILE, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    if op == "join":
+        t_data["players"].append(payload["player_id"])
+    elif op == "teams":
+        t_data["teams"]["a"]["members"] = payload["a"]
+        t_data["teams"]["b"]["members"] = payload["b"]
+        t_data["team_matches"]["round1"] = payload["matches"]
+    elif op == "round":
+        t_data[payload["scope"]][payload["round"]] = payload["matches"]
+    elif op == "winner":
+        t_data[payload["scope"]][payload["round"]][payload["match"]]["winner_id"] = payload["winner_id"]
+        if payload.get("team"):
+            t_data["team_scores"][payload["team"]] += 1
+    else:
+        raise ValueError(f"Unknown tournament mutation: {op}")
+    return t_data
+
+def load_data() -> Dict:
+    """Loads the last tournament snapshot and replays the journal on top of it."""
+    return get_store().replay(TOURNAMENT_KEY, {"is_active": False}, apply_mutation)
+
+def record_mutation(t_data: Dict, op: str, payload: Dict) -> Dict:
+    """Journals a mutation, then applies it to `t_data` and returns the new state.
+
+    The entry is applied to a copy inside the same transaction, so one that can't be
+    applied is rolled back instead of poisoning every later replay. Starting or ending
+    a tournament replaces the whole state, so those are snapshotted straight away;
+    otherwise the journal is compacted every SNAPSHOT_EVERY entries."""
+    store = get_store()
+    with store.transaction():
+        store.journal_append(TOURNAMENT_KEY, op, payload)
+        t_data = apply_mutation(copy.deepcopy(t_data), op, payload)
+        if op in ("start", "end") or store.journal_length(TOURNAMENT_KEY) >= SNAPSHOT_EVERY:
+            recover_tournament()
+    return t_data
+
+def recover_tournament() -> int:
+    """Replays any journaled mutations onto the last snapshot and compacts them. Returns how many were replayed."""
+    return get_store().compact_journal(TOURNAMENT_KEY, {"is_active": False}, apply_mutation)
+
+def archive_tournament(t_data: Dict, winners: List[int], summary: Dict):
+    """Appends a finished tournament to the history before its live state is cleared."""
+    get_store().archive_tournament(
+        name=t_data["name"], t_type=t_data["type"], started_at=t_data.get("started_at"),
+        players=t_data.get("players", []), winners=winners, summary=summary
+    )
 
-def save_data(data: Dict):
-    """Saves tournament data to the JSON file."""
-    with open(TOURNAMENT_FILE, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=4)
+def match_loser(match: Dict) -> int:
+    return match["p1_id"] if match["p1_id"] != match["winner_id"] else match["p2_id"]
+
+def record_result(t_data: Dict, payload: Dict, seeds: Dict[int, float]) -> Dict:
+    """Journals a "winner" mutation and updates both players' ratings in the same transaction.
+
+    `seeds` holds the starting rating for either player if this is their first rated match."""
+    store = get_store()
+    with store.transaction():
+        t_data = record_mutation(t_data, "winner", payload)
+        winner_id = payload["winner_id"]
+        loser_id = match_loser(t_data[payload["scope"]][payload["round"]][payload["match"]])
+        store.record_match_result(winner_id, loser_id, winner_seed=seeds[winner_id], loser_seed=seeds[loser_id])
+    return t_data
+
+def truncate_lines(lines: List[str], limit: int = 1024, sep: str = "\n") -> str:
+    """Joins lines up to Discord's embed field limit, noting how many were left out."""
+    text = ""
+    for i, line in enumerate(lines):
+        candidate = line if not text else text + sep + line
+        remaining = len(lines) - i - 1
+        if len(candidate) + (len(f"{sep}...and {remaining} more") if remaining else 0) > limit:
+            return text + f"{sep}...and {len(lines) - i} more"
+        text = candidate
+    return text
 
 # --- COG DEFINITION ---
 class Tournament(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
 
+    async def cog_load(self):
+        replayed = recover_tournament()
+        if replayed: print(f"  [+] Tournament state recovered: replayed {replayed} journaled changes.")
+
     def is_admin(self, interaction: discord.Interaction) -> bool:
         """Helper to check for admin role."""
         admin_ids = set(self.bot.config["admin_role_ids"])
         user_role_ids = {role.id for role in interaction.user.roles}
         return not admin_ids.isdisjoint(user_role_ids)
 
+    def player_ratings(self, guild: discord.Guild, player_ids: List[int]) -> Dict[int, float]:
+        """Rating for every player: their Elo once they have a rated match, otherwise a seed from their rank."""
+        ratings = get_store().get_ratings(player_ids)
+        hierarchy = self.bot.config["rank_hierarchy"]
+        for p_id in player_ids:
+            if p_id in ratings: continue
+            member = guild.get_member(p_id)
+            rank_index = next((hierarchy.index(r.id) for r in member.roles if r.id in hierarchy), None) if member else None
+            ratings[p_id] = rank_seed(rank_index)
+        return ratings
+
     # --- HELPER: FORMAT EMBEDS ---
     def format_bracket_embed(self, interaction: discord.Interaction, t_data: Dict) -> discord.Embed:
         embed = discord.Embed(title=f"⚔️ Bracket for {t_data['name']} ⚔️", color=discord.Color.red())
@@ -71,8 +159,8 @@ class Tournament(commands.Cog):
             color=discord.Color.blue()
         )
         
-        team_a_members = ", ".join([interaction.guild.get_member(m).mention for m in t_data["teams"]["a"]["members"]]) or "No members yet."
-        team_b_members = ", ".join([interaction.guild.get_member(m).mention for m in t_data["teams"]["b"]["members"]]) or "No members yet."
+        team_a_members = truncate_lines([f"<@{m}>" for m in t_data["teams"]["a"]["members"]], sep=", ") or "No members yet."
+        team_b_members = truncate_lines([f"<@{m}>" for m in t_data["teams"]["b"]["members"]], sep=", ") or "No members yet."
 
         embed.add_field(name=f"Team: {team_a_name} ({len(t_data['teams']['a']['members'])} members)", value=team_a_members, inline=False)
         embed.add_field(name=f"Team: {team_b_name} ({len(t_data['teams']['b']['members'])} members)", value=team_b_members, inline=False)
@@ -80,23 +168,23 @@ class Tournament(commands.Cog):
         if t_data.get("team_matches"):
             last_round_name = list(t_data["team_matches"].keys())[-1]
             matches = t_data["team_matches"][last_round_name]
-            fight_card_text = ""
+            fight_lines = []
             for i, match in enumerate(matches):
-                p1 = interaction.guild.get_member(match['p1_id'])
-                p2 = interaction.guild.get_member(match['p2_id'])
                 if match.get('winner_id'):
-                    winner = interaction.guild.get_member(match['winner_id'])
-                    fight_card_text += f"`Fight {i+1}`: {p1.mention} vs {p2.mention} -> **Winner: {winner.mention}**\n"
+                    fight_lines.append(f"`Fight {i+1}`: <@{match['p1_id']}> vs <@{match['p2_id']}> -> **Winner: <@{match['winner_id']}>**")
                 else:
-                    fight_card_text += f"`Fight {i+1}`: {p1.mention} vs {p2.mention}\n"
+                    fight_lines.append(f"`Fight {i+1}`: <@{match['p1_id']}> vs <@{match['p2_id']}>")
             
-            embed.add_field(name=f"--- Fight Card: {last_round_name.replace('round', 'Round ')} ---", value=fight_card_text, inline=False)
+            embed.add_field(name=f"--- Fight Card: {last_round_name.replace('round', 'Round ')} ---", value=truncate_lines(fight_lines) or "TBD", inline=False)
             
         return embed
 
     # --- HELPER: CHECK AND ADVANCE ROUND (WITH RANKING) ---
-    async def check_and_advance_round(self, interaction: discord.Interaction):
+    async def check_and_advance_round(self, interaction: discord.Interaction, tournament_name: str, started_at: str = None):
         t_data = load_data()
+        # This runs as a queued job; the tournament may have ended or been replaced since it was queued.
+        if not (t_data.get("is_active") and t_data.get("type") == "solo"): return
+        if t_data["name"] != tournament_name or t_data.get("started_at") != started_at: return
         last_round_name = list(t_data["bracket"].keys())[-1]
         last_round_matches = t_data["bracket"][last_round_name]
 
@@ -138,16 +226,22 @@ class Tournament(commands.Cog):
                 mentions = ", ".join([interaction.guild.get_member(p).mention for p in final_rankings["round1"]])
                 embed.add_field(name="⚔️ Eliminated in Round 1", value=mentions, inline=False)
             
+            # Close the tournament before the first await so a second queued check can't rank it twice.
+            # Archive and end commit together, so a retry after a crash can't credit the players twice.
+            with get_store().transaction():
+                archive_tournament(t_data, [final_rankings["1st"]], {
+                    "champion": final_rankings["1st"], "runner_up": final_rankings["2nd"],
+                    "semi": final_rankings["semi"], "players": len(t_data["players"]), "rounds": len(bracket)
+                })
+                record_mutation(t_data, "end", {})
             await interaction.channel.send(embed=embed)
-            save_data({"is_active": False})
             return
 
         next_round_num = int(last_round_name.replace('round', '')) + 1
         next_round_name = f"round{next_round_num}"
         random.shuffle(winners_ids)
         new_matches = [{"p1_id": winners_ids[i], "p2_id": winners_ids[i+1], "winner_id": None} for i in range(0, len(winners_ids), 2)]
-        t_data["bracket"][next_round_name] = new_matches
-        save_data(t_data)
+        t_data = record_mutation(t_data, "round", {"scope": "bracket", "round": next_round_name, "matches": new_matches})
         
         embed = self.format_bracket_embed(interaction, t_data)
         await interaction.channel.send(f"**All winners recorded! The next round has been generated automatically.**", embed=embed)
@@ -167,8 +261,8 @@ class Tournament(commands.Cog):
         random.shuffle(player_ids)
         matches = [{"p1_id": player_ids[i], "p2_id": player_ids[i+1], "winner_id": None} for i in range(0, len(player_ids), 2)]
         
-        new_data = {"is_active": True, "type": "solo", "name": name, "players": player_ids, "bracket": {"round1": matches}}
-        save_data(new_data)
+        new_data = {"is_active": True, "type": "solo", "name": name, "started_at": datetime.datetime.now(datetime.timezone.utc).isoformat(), "players": player_ids, "bracket": {"round1": matches}}
+        new_data = record_mutation(t_data, "start", {"state": new_data})
         
         embed = self.format_bracket_embed(interaction, new_data)
         await interaction.response.send_message(f"**A new 1v1 tournament has started!** The bracket has been generated.", embed=embed)
@@ -182,37 +276,37 @@ class Tournament(commands.Cog):
         if not t_data.get("is_active"): return await interaction.response.send_message("No active tournament.", ephemeral=True)
 
         if t_data.get("type") == "solo":
-            found_match = False
-            for matches in t_data["bracket"].values():
-                for match in matches:
+            found_match = None
+            for round_name, matches in t_data["bracket"].items():
+                for i, match in enumerate(matches):
                     if (match["p1_id"] == winner.id or match["p2_id"] == winner.id) and not match["winner_id"]:
-                        match["winner_id"] = winner.id
-                        found_match = True
+                        found_match = (round_name, i)
                         break
                 if found_match: break
             
             if not found_match: return await interaction.response.send_message("Could not find an open match for this player.", ephemeral=True)
 
-            save_data(t_data)
+            round_name, match_index = found_match
+            match = t_data["bracket"][round_name][match_index]
+            seeds = self.player_ratings(interaction.guild, [match["p1_id"], match["p2_id"]])
+            t_data = record_result(t_data, {"scope": "bracket", "round": round_name, "match": match_index, "winner_id": winner.id}, seeds)
             await interaction.response.send_message("Winner recorded. Checking if round is complete...", ephemeral=True)
-            await self.check_and_advance_round(interaction)
+            self.bot.jobs.submit(f"advance-round: {t_data['name']}", self.check_and_advance_round(interaction, t_data["name"], t_data.get("started_at")), priority=PRIORITY_HIGH, on_error=notify_interaction(interaction, "Advancing the bracket"))
 
         elif t_data.get("type") == "team":
             last_round_name = list(t_data["team_matches"].keys())[-1]
-            found_match = False
-            for match in t_data["team_matches"][last_round_name]:
+            found_match = None
+            for i, match in enumerate(t_data["team_matches"][last_round_name]):
                 if (match["p1_id"] == winner.id or match["p2_id"] == winner.id) and not match["winner_id"]:
-                    match["winner_id"] = winner.id
-                    if winner.id in t_data["teams"]["a"]["members"]:
-                        t_data["team_scores"]["a"] += 1
-                    else:
-                        t_data["team_scores"]["b"] += 1
-                    found_match = True
+                    found_match = i
                     break
             
-            if not found_match: return await interaction.response.send_message("Could not find an open match for this player.", ephemeral=True)
+            if found_match is None: return await interaction.response.send_message("Could not find an open match for this player.", ephemeral=True)
 
-            save_data(t_data)
+            team = "a" if winner.id in t_data["teams"]["a"]["members"] else "b"
+            match = t_data["team_matches"][last_round_name][found_match]
+            seeds = self.player_ratings(interaction.guild, [match["p1_id"], match["p2_id"]])
+            t_data = record_result(t_data, {"scope": "team_matches", "round": last_round_name, "match": found_match, "winner_id": winner.id, "team": team}, seeds)
             embed = self.format_team_status_embed(interaction, t_data)
             await interaction.response.send_message("Winner recorded and score updated!", embed=embed)
 
@@ -226,6 +320,7 @@ class Tournament(commands.Cog):
 
         new_data = {
             "is_active": True, "type": "team", "name": name,
+            "started_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
             "players": [],
             "teams": {
                 "a": {"name": team_a_name, "members": []}, 
@@ -234,7 +329,7 @@ class Tournament(commands.Cog):
             "team_scores": {"a": 0, "b": 0},
             "team_matches": {}
         }
-        save_data(new_data)
+        record_mutation(t_data, "start", {"state": new_data})
         
         embed = discord.Embed(title=f"🔥 Team Tournament Registration: {name} 🔥", description=f"Players can now join the tournament pool using `/team-tournament-join`!", color=discord.Color.teal())
         await interaction.response.send_message(embed=embed)
@@ -248,12 +343,11 @@ class Tournament(commands.Cog):
         if interaction.user.id in t_data["players"]:
             return await interaction.response.send_message("You are already registered for the tournament.", ephemeral=True)
         
-        t_data["players"].append(interaction.user.id)
-        save_data(t_data)
+        t_data = record_mutation(t_data, "join", {"player_id": interaction.user.id})
         
         await interaction.response.send_message(f"✅ You have successfully joined the player pool for **{t_data['name']}**! Waiting for an admin to create teams.", ephemeral=True)
 
-    @app_commands.command(name="team-tournament-create-teams", description="[ADMIN] Assign players to teams and create Round 1 fights.")
+    @app_commands.command(name="team-tournament-create-teams", description="[ADMIN] Split players into balanced teams and create Round 1 fights.")
     async def team_tournament_create_teams(self, interaction: discord.Interaction):
         if not self.is_admin(interaction): return await interaction.response.send_message("Permission denied.", ephemeral=True)
         t_data = load_data()
@@ -262,29 +356,18 @@ class Tournament(commands.Cog):
         players = t_data["players"]
         if not players: return await interaction.response.send_message("No players have registered yet.", ephemeral=True)
             
-        random.shuffle(players)
-        midpoint = len(players) // 2
-        t_data["teams"]["a"]["members"] = players[:midpoint]
-        t_data["teams"]["b"]["members"] = players[midpoint:]
-        
-        team_a_shuffled = list(t_data["teams"]["a"]["members"])
-        team_b_shuffled = list(t_data["teams"]["b"]["members"])
-        random.shuffle(team_a_shuffled)
-        random.shuffle(team_b_shuffled)
-        
-        matches = []
-        min_len = min(len(team_a_shuffled), len(team_b_shuffled))
-        for i in range(min_len):
-            matches.append({"p1_id": team_a_shuffled[i], "p2_id": team_b_shuffled[i], "winner_id": None})
-        
-        t_data["team_matches"]["round1"] = matches
-        save_data(t_data)
+        ratings = self.player_ratings(interaction.guild, players)
+        team_a, team_b = balance_teams(ratings)
+        matches = [{"p1_id": a, "p2_id": b, "winner_id": None} for a, b in fight_card(team_a, team_b, ratings)]
+        t_data = record_mutation(t_data, "teams", {"a": team_a, "b": team_b, "matches": matches})
         
+        avg_a = sum(ratings[p] for p in team_a) / len(team_a) if team_a else 0
+        avg_b = sum(ratings[p] for p in team_b) / len(team_b) if team_b else 0
         embed = self.format_team_status_embed(interaction, t_data)
-        await interaction.response.send_message(f"**Teams have been created and Round 1 fights are set!**", embed=embed)
+        await interaction.response.send_message(f"**Teams have been balanced (avg rating {avg_a:.0f} vs {avg_b:.0f}) and Round 1 fights are set!**", embed=embed)
         log_event("TEAMS_CREATED", interaction.user, {"name": t_data["name"]})
 
-    @app_commands.command(name="team-tournament-next-round", description="[ADMIN] Generate a new random fight card for the next round.")
+    @app_commands.command(name="team-tournament-next-round", description="[ADMIN] Generate a balanced fight card for the next round.")
     async def team_tournament_next_round(self, interaction: discord.Interaction):
         if not self.is_admin(interaction): return await interaction.response.send_message("Permission denied.", ephemeral=True)
         t_data = load_data()
@@ -297,18 +380,14 @@ class Tournament(commands.Cog):
         next_round_num = int(last_round_name.replace('round', '')) + 1
         next_round_name = f"round{next_round_num}"
         
-        team_a_shuffled = list(t_data["teams"]["a"]["members"])
-        team_b_shuffled = list(t_data["teams"]["b"]["members"])
-        random.shuffle(team_a_shuffled)
-        random.shuffle(team_b_shuffled)
-        
-        matches = []
-        min_len = min(len(team_a_shuffled), len(team_b_shuffled))
-        for i in range(min_len):
-            matches.append({"p1_id": team_a_shuffled[i], "p2_id": team_b_shuffled[i], "winner_id": None})
+        team_a = t_data["teams"]["a"]["members"]
+        team_b = t_data["teams"]["b"]["members"]
+        ratings = self.player_ratings(interaction.guild, team_a + team_b)
+        previous_rounds = list(t_data["team_matches"].values())
+        card = fight_card(team_a, team_b, ratings, counts=fight_counts(previous_rounds), played=past_pairs(previous_rounds))
+        matches = [{"p1_id": a, "p2_id": b, "winner_id": None} for a, b in card]
         
-        t_data["team_matches"][next_round_name] = matches
-        save_data(t_data)
+        t_data = record_mutation(t_data, "round", {"scope": "team_matches", "round": next_round_name, "matches": matches})
         
         embed = self.format_team_status_embed(interaction, t_data)
         await interaction.response.send_message(f"**A new fight card for {next_round_name} has been generated!**", embed=embed)
@@ -335,6 +414,7 @@ class Tournament(commands.Cog):
         if not t_data.get("is_active"): return await interaction.response.send_message("There is no active tournament.", ephemeral=True)
             
         tournament_name = t_data["name"]
+        final_embed = None
         
         if t_data.get("type") == "team":
             team_a_name = t_data["teams"]["a"]["name"]; team_b_name = t_data["teams"]["b"]["name"]
@@ -345,11 +425,63 @@ class Tournament(commands.Cog):
             else: winner_text = "The result is a draw!"
             
             final_embed = discord.Embed(title=f"🏁 Final Score for {tournament_name} 🏁", description=f"**{team_a_name}:** `{score_a}` points\n**{team_b_name}:** `{score_b}` points\n\n{winner_text}", color=discord.Color.gold())
-            await interaction.channel.send(embed=final_embed)
 
-        save_data({"is_active": False})
+            winning_team = "a" if score_a > score_b else "b" if score_b > score_a else None
+            winners = t_data["teams"][winning_team]["members"] if winning_team else []
+            summary = {
+                "teams": {k: {"name": t_data["teams"][k]["name"], "score": t_data["team_scores"][k], "members": len(t_data["teams"][k]["members"])} for k in ("a", "b")},
+                "winner": t_data["teams"][winning_team]["name"] if winning_team else None,
+                "players": len(t_data["players"]), "rounds": len(t_data["team_matches"])
+            }
+        else:
+            # A solo bracket ended before its final; keep the record but award no title.
+            winners, summary = [], {"completed": False, "players": len(t_data["players"]), "rounds": len(t_data.get("bracket", {}))}
+
+        # Archive and end commit together, so retrying after a crash can't credit the players twice.
+        with get_store().transaction():
+            archive_tournament(t_data, winners, summary)
+            record_mutation(t_data, "end", {})
         await interaction.response.send_message(f"The tournament **{tournament_name}** has been officially concluded.")
+        if final_embed: await interaction.channel.send(embed=final_embed)
         log_event("TOURNAMENT_END", interaction.user, {"name": tournament_name})
 
+    # --- HISTORY AND PLAYER STATS ---
+    @app_commands.command(name="player-stats", description="Show a player's rating and tournament record.")
+    @app_commands.describe(member="The player to look up (defaults to you).")
+    async def player_stats(self, interaction: discord.Interaction, member: discord.Member = None):
+        member = member or interaction.user
+        stats = get_store().get_player_stats(member.id)
+        if not stats: return await interaction.response.send_message(f"{member.mention} has not played any tournament matches yet.", ephemeral=True)
+
+        played = stats["wins"] + stats["losses"]
+        win_rate = f"{stats['wins'] / played:.0%}" if played else "-"
+        embed = discord.Embed(title=f"📈 Player Stats: {member.display_name}", color=discord.Color.blue())
+        embed.add_field(name="Rating", value=f"`{stats['rating']:.0f}` (#{stats['rank']})" if played else "Unrated", inline=True)
+        embed.add_field(name="Record", value=f"{stats['wins']}W - {stats['losses']}L ({win_rate})", inline=True)
+        embed.add_field(name="Tournaments", value=f"{stats['tournaments']} played, {stats['titles']} won 🏆", inline=True)
+        await interaction.response.send_message(embed=embed)
+
+    @app_commands.command(name="tournament-history", description="Show recently completed tournaments.")
+    @app_commands.describe(count="How many tournaments to show (max 10).")
+    async def tournament_history(self, interaction: discord.Interaction, count: int = 5):
+        history = list(get_store().iter_tournament_history(limit=max(1, min(count, 10))))
+        if not history: return await interaction.response.send_message("No tournaments have been completed yet.", ephemeral=True)
+
+        embed = discord.Embed(title="📜 Tournament History", color=discord.Color.gold())
+        for entry in history:
+            summary = entry["summary"]
+            ended_dt = datetime.datetime.fromisoformat(entry["ended_at"])
+            if entry["type"] == "team":
+                teams = summary["teams"]
+                result = f"`{teams['a']['name']}` {teams['a']['score']} - {teams['b']['score']} `{teams['b']['name']}`"
+                result += f"\n**Winner:** {summary['winner']}" if summary["winner"] else "\n**Draw**"
+            elif summary.get("champion"):
+                result = f"🥇 <@{summary['champion']}>  🥈 <@{summary['runner_up']}>"
+            else:
+                result = "Ended before the final."
+            field_value = f"<t:{int(ended_dt.timestamp())}:R> • {summary['players']} players, {summary['rounds']} rounds\n{result}"
+            embed.add_field(name=f"🔹 {entry['name']} ({entry['type']})", value=field_value, inline=False)
+        await interaction.response.send_message(embed=embed)
+
 async def setup(bot: commands.Bot):
     await bot.add_cog(Tournament(bot))
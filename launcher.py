@@ -0,0 +1,77 @@
+import multiprocessing
+import time
+
+from bot import ShardedGuildBot, TOKEN, config, keep_alive
+
+# --- Multi-process shard launcher ---
+# Splits the shards into groups and runs each group in its own worker process.
+# All workers share tournament and audit state through data/state.db (see
+# utils/state_store.py), so a crashed worker can be restarted on its own
+# without touching the others.
+CHECK_INTERVAL = 5
+# A worker that crashes again within STABLE_SECONDS of starting waits twice as
+# long before each restart (up to MAX_BACKOFF); after MAX_QUICK_RESTARTS such
+# crashes in a row (bad token, broken config...) its shard group is given up on.
+STABLE_SECONDS = 60
+MAX_BACKOFF = 300
+MAX_QUICK_RESTARTS = 5
+
+def shard_groups(shard_count: int, processes: int) -> list:
+    """Splits shard ids 0..shard_count-1 into `processes` contiguous groups."""
+    processes = max(1, min(processes, shard_count))
+    size, extra = divmod(shard_count, processes)
+    groups, start = [], 0
+    for i in range(processes):
+        end = start + size + (1 if i < extra else 0)
+        groups.append(list(range(start, end)))
+        start = end
+    return groups
+
+def run_shard_group(shard_ids: list, shard_count: int):
+    """Worker entry point: runs one AutoShardedBot that only connects the given shards."""
+    bot = ShardedGuildBot(shard_ids=shard_ids, shard_count=shard_count)
+    bot.run(TOKEN)
+
+def start_worker(shard_ids: list, shard_count: int) -> multiprocessing.Process:
+    process = multiprocessing.Process(target=run_shard_group, args=(shard_ids, shard_count), name=f"shards-{shard_ids[0]}-{shard_ids[-1]}")
+    process.start()
+    print(f"  [+] Started {process.name} (pid {process.pid})")
+    return process
+
+def main():
+    shard_count = config.get("shard_count", 1)
+    processes = config.get("shard_processes", multiprocessing.cpu_count())
+    groups = shard_groups(shard_count, processes)
+
+    print(f"--- Launching {shard_count} shards in {len(groups)} processes ---")
+    keep_alive() # The web server runs once, in the launcher, not in every worker.
+    workers = {tuple(group): start_worker(group, shard_count) for group in groups}
+    started_at = {group: time.monotonic() for group in workers}
+    quick_restarts = {group: 0 for group in workers}
+    restart_at = {}
+
+    # Supervise: restart any worker that exits, leaving the other shard groups running.
+    while workers:
+        time.sleep(CHECK_INTERVAL)
+        now = time.monotonic()
+        for group, process in list(workers.items()):
+            if process.is_alive():
+                continue
+            if group not in restart_at:
+                quick_restarts[group] = quick_restarts[group] + 1 if now - started_at[group] < STABLE_SECONDS else 0
+                if quick_restarts[group] > MAX_QUICK_RESTARTS:
+                    print(f"  [!] {process.name} keeps crashing (exit code {process.exitcode}); giving up on it.")
+                    del workers[group]
+                    continue
+                delay = min(CHECK_INTERVAL * 2 ** quick_restarts[group], MAX_BACKOFF)
+                restart_at[group] = now + delay
+                print(f"  [!] {process.name} exited with code {process.exitcode}, restarting in {delay}s...")
+            if now >= restart_at[group]:
+                del restart_at[group]
+                workers[group] = start_worker(list(group), shard_count)
+                started_at[group] = time.monotonic()
+    print("--- All shard groups have stopped ---")
+
+if __name__ == "__main__":
+    multiprocessing.set_start_method("spawn")
+    main()
@@ -0,0 +1,39 @@
+import discord
+import asyncio
+import datetime
+import re
+from typing import List, Optional, Tuple
+
+# --- ANNOUNCEMENT DELIVERY ---
+# Fan-out sends run concurrently but never more than MAX_CONCURRENT_SENDS at
+# once; discord.py handles any 429s on top of that.
+MAX_CONCURRENT_SENDS = 5
+_send_limit: Optional[asyncio.Semaphore] = None
+
+def parse_channel_ids(text: str) -> List[int]:
+    """Channel ids from a string of channel mentions like '#news #war-room'."""
+    return [int(channel_id) for channel_id in re.findall(r"<#(\d+)>", text or "")]
+
+def build_announcement_embed(title: str, message: str, footer: str, icon_url=None) -> discord.Embed:
+    embed = discord.Embed(title=f"📣 {title}", description=message.replace("\\n", "\n"), color=discord.Color.gold(), timestamp=datetime.datetime.now())
+    embed.set_footer(text=footer, icon_url=icon_url)
+    return embed
+
+async def fan_out(bot, channel_ids: List[int], content: Optional[str], embed: discord.Embed) -> List[Tuple[int, Optional[str]]]:
+    """Sends the same message to every channel concurrently. Returns (channel_id, error or None) per channel."""
+    global _send_limit
+    if _send_limit is None:
+        _send_limit = asyncio.Semaphore(MAX_CONCURRENT_SENDS)
+
+    async def send(channel_id: int) -> Tuple[int, Optional[str]]:
+        # The channel may live on another shard group's guilds, so fall back to a partial
+        # messageable; a channel that really is gone surfaces as NotFound from send().
+        channel = bot.get_channel(channel_id) or bot.get_partial_messageable(channel_id)
+        async with _send_limit:
+            try:
+                await channel.send(content=content, embed=embed)
+            except discord.HTTPException as e:
+                return channel_id, str(e)
+        return channel_id, None
+
+    return await asyncio.gather(*(send(channel_id) for channel_id in channel_ids))
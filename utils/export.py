@@ -0,0 +1,80 @@
+import discord
+import csv
+import gzip
+import io
+import json
+import tempfile
+from typing import Dict, Iterable, List
+
+# --- STREAMING FILE EXPORTS ---
+# Rows are written one at a time through a gzip stream into a spooled buffer:
+# it stays in memory while small and moves to a temporary file once the
+# compressed output passes SPOOL_LIMIT, so large exports never sit in RAM.
+SPOOL_LIMIT = 4 * 1024 * 1024
+EXPORT_FORMATS = ("csv", "jsonl")
+
+class GzipExportWriter:
+    """Incremental gzip CSV/JSONL writer, for exports fed in batches rather than from one iterator.
+
+    Call write_rows() any number of times, then finish() for (buffer, row_count); the caller closes the buffer."""
+
+    def __init__(self, fields: List[str], file_format: str = "csv"):
+        if file_format not in EXPORT_FORMATS:
+            raise ValueError(f"Unknown export format: {file_format}")
+        self.fields = fields
+        self.file_format = file_format
+        self.count = 0
+        self.buffer = tempfile.SpooledTemporaryFile(max_size=SPOOL_LIMIT)
+        self.gz = gzip.GzipFile(fileobj=self.buffer, mode="wb")
+        self.text = io.TextIOWrapper(self.gz, encoding="utf-8", newline="")
+        if file_format == "csv":
+            self.csv = csv.DictWriter(self.text, fieldnames=fields, extrasaction="ignore")
+            self.csv.writeheader()
+
+    def write_rows(self, rows: Iterable[Dict]):
+        if self.file_format == "csv":
+            for row in rows:
+                self.csv.writerow({k: json.dumps(v, ensure_ascii=False) if isinstance(v, (dict, list)) else v for k, v in row.items()})
+                self.count += 1
+        else:
+            for row in rows:
+                self.text.write(json.dumps({k: row.get(k) for k in self.fields}, ensure_ascii=False) + "\n")
+                self.count += 1
+
+    def finish(self):
+        self.text.flush()
+        self.text.detach() # Close the gzip stream ourselves so the buffer stays open.
+        self.gz.close()
+        self.buffer.seek(0)
+        return self.buffer, self.count
+
+    def abort(self):
+        self.buffer.close()
+
+def write_gzip_export(rows: Iterable[Dict], fields: List[str], file_format: str = "csv"):
+    """Streams `rows` into a gzip-compressed CSV or JSONL buffer, rewound and ready to upload.
+
+    Returns (buffer, row_count); the caller closes the buffer."""
+    writer = GzipExportWriter(fields, file_format)
+    try:
+        writer.write_rows(rows)
+        return writer.finish()
+    except BaseException:
+        writer.abort()
+        raise
+
+def buffer_size(buffer) -> int:
+    buffer.seek(0, io.SEEK_END)
+    size = buffer.tell()
+    buffer.seek(0)
+    return size
+
+async def send_export(interaction: discord.Interaction, buffer, count: int, filename: str):
+    """Uploads a finished export as a follow-up attachment, or explains why it can't."""
+    try:
+        size = buffer_size(buffer)
+        if size > interaction.guild.filesize_limit:
+            return await interaction.followup.send(f"⚠️ The export is {size / 1024 / 1024:.1f} MB, which is over this server's upload limit.", ephemeral=True)
+        await interaction.followup.send(f"📦 Exported **{count}** rows.", file=discord.File(buffer, filename=filename), ephemeral=True)
+    finally:
+        buffer.close()
@@ -0,0 +1,113 @@
+import asyncio
+import itertools
+import time
+import traceback
+from collections import deque
+from typing import Awaitable, Callable, Coroutine, Dict, List, Optional
+
+# --- BACKGROUND JOB QUEUE ---
+# Commands acknowledge the interaction first and hand slow work (bulk sends,
+# role loops) to this queue. Lower numbers run first. URGENT jobs have their
+# own worker, so a gank ping never waits behind a long role clean-up.
+PRIORITY_URGENT = 0
+PRIORITY_HIGH = 1
+PRIORITY_NORMAL = 2
+PRIORITY_LOW = 3
+
+PRIORITY_NAMES = {PRIORITY_URGENT: "urgent", PRIORITY_HIGH: "high", PRIORITY_NORMAL: "normal", PRIORITY_LOW: "low"}
+
+class Job:
+    def __init__(self, job_id: int, name: str, priority: int, coro: Coroutine, on_error: Optional[Callable[[Exception], Awaitable]] = None):
+        self.id = job_id
+        self.name = name[:60]
+        self.priority = priority
+        self.coro = coro
+        self.on_error = on_error
+        self.state = "queued"
+        self.error: Optional[str] = None
+        self.queued_at = time.monotonic()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    @property
+    def wait_time(self) -> float:
+        """Seconds spent in the queue (so far, if it has not started)."""
+        return (self.started_at or time.monotonic()) - self.queued_at
+
+    @property
+    def run_time(self) -> float:
+        """Seconds spent running (so far, if it has not finished)."""
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.monotonic()) - self.started_at
+
+def notify_interaction(interaction, what: str) -> Callable[[Exception], Awaitable]:
+    """Failure callback for jobs started from a slash command: tells the user privately that `what` failed."""
+    async def on_error(error: Exception):
+        await interaction.followup.send(f"⚠️ {what} failed: {error}", ephemeral=True)
+    return on_error
+
+class JobQueue:
+    def __init__(self, workers: int = 4, history: int = 20):
+        self.worker_count = max(1, workers)
+        self._queue: asyncio.PriorityQueue = asyncio.PriorityQueue()
+        self._urgent: asyncio.Queue = asyncio.Queue()
+        self._ids = itertools.count(1)
+        self._tasks: List[asyncio.Task] = []
+        self.active: Dict[int, Job] = {}
+        self.finished = deque(maxlen=history)
+
+    def start(self):
+        self._tasks = [asyncio.create_task(self._worker(self._urgent, get_job=lambda item: item))]
+        self._tasks += [asyncio.create_task(self._worker(self._queue, get_job=lambda item: item[2])) for _ in range(self.worker_count)]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        for job in self.active.values():
+            if job.state == "queued":
+                job.coro.close() # Never started; close it so Python doesn't warn about an unawaited coroutine.
+        self._tasks = []
+
+    def submit(self, name: str, coro: Coroutine, priority: int = PRIORITY_NORMAL, on_error: Optional[Callable[[Exception], Awaitable]] = None) -> Job:
+        """Queues a coroutine to run in the background and returns its Job record.
+
+        If the job raises, `on_error` is awaited with the exception (see notify_interaction)."""
+        job = Job(next(self._ids), name, priority, coro, on_error)
+        self.active[job.id] = job
+        if priority == PRIORITY_URGENT:
+            self._urgent.put_nowait(job)
+        else:
+            self._queue.put_nowait((priority, job.id, job))
+        return job
+
+    def queued(self) -> List[Job]:
+        return sorted((j for j in self.active.values() if j.state == "queued"), key=lambda j: (j.priority, j.id))
+
+    def running(self) -> List[Job]:
+        return [j for j in self.active.values() if j.state == "running"]
+
+    async def _worker(self, queue: asyncio.Queue, get_job):
+        while True:
+            job = get_job(await queue.get())
+            job.state = "running"
+            job.started_at = time.monotonic()
+            try:
+                await job.coro
+                job.state = "done"
+            except Exception as e:
+                job.state = "failed"
+                job.error = str(e)
+                print(f"  [!] Job '{job.name}' failed: {e}")
+                traceback.print_exc()
+                if job.on_error:
+                    try:
+                        await job.on_error(e)
+                    except Exception as notify_error:
+                        print(f"  [!] Could not report failure of job '{job.name}': {notify_error}")
+            finally:
+                job.finished_at = time.monotonic()
+                self.active.pop(job.id, None)
+                self.finished.appendleft(job)
+                queue.task_done()
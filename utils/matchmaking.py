@@ -0,0 +1,94 @@
+import random
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .ratings import DEFAULT_RATING
+
+# --- TEAM MATCHMAKING ---
+# Players without any recorded matches are seeded from their rank:
+# each step up rank_hierarchy is worth RANK_STEP rating points.
+RANK_STEP = 50.0
+# How far (in positions of the rating-sorted card) we look for a swap partner
+# when the closest pairing would be a rematch.
+REMATCH_WINDOW = 4
+
+def rank_seed(rank_index: Optional[int]) -> float:
+    """Starting rating for a player at position `rank_index` in rank_hierarchy (None = unranked)."""
+    if rank_index is None:
+        return DEFAULT_RATING
+    return DEFAULT_RATING + rank_index * RANK_STEP
+
+def balance_teams(ratings: Dict[int, float]) -> Tuple[List[int], List[int]]:
+    """Splits players into two teams whose sizes differ by at most one and whose rating totals are as close as possible.
+
+    Strongest players are placed first, each on the team with the lower total
+    that still has room, which keeps the totals close in O(n log n)."""
+    players = list(ratings)
+    random.shuffle(players) # So equally rated players don't always land on the same side.
+    players.sort(key=lambda p: ratings[p], reverse=True)
+
+    capacity = (len(players) + 1) // 2
+    team_a, team_b = [], []
+    total_a = total_b = 0.0
+    for player in players:
+        if len(team_b) >= capacity or (len(team_a) < capacity and total_a <= total_b):
+            team_a.append(player); total_a += ratings[player]
+        else:
+            team_b.append(player); total_b += ratings[player]
+    return team_a, team_b
+
+def fight_counts(rounds: Iterable[List[Dict]]) -> Dict[int, int]:
+    """How many fights each player has been scheduled for across the given rounds."""
+    counts = {}
+    for matches in rounds:
+        for match in matches:
+            counts[match["p1_id"]] = counts.get(match["p1_id"], 0) + 1
+            counts[match["p2_id"]] = counts.get(match["p2_id"], 0) + 1
+    return counts
+
+def past_pairs(rounds: Iterable[List[Dict]]) -> Set[frozenset]:
+    return {frozenset((m["p1_id"], m["p2_id"])) for matches in rounds for m in matches}
+
+def fight_card(team_a: List[int], team_b: List[int], ratings: Dict[int, float],
+               counts: Optional[Dict[int, int]] = None, played: Optional[Set[frozenset]] = None) -> List[Tuple[int, int]]:
+    """Pairs team A fighters with team B fighters for one round.
+
+    - When the teams differ in size, the players of the larger team who have
+      fought the least are picked, so the extra players rotate in.
+    - Both sides are sorted by rating and paired in order, which minimises the
+      total rating gap.
+    - Pairs that already fought are swapped with a nearby pair when that avoids
+      the rematch.
+
+    Returns (team_a_player, team_b_player) tuples."""
+    counts = counts or {}
+    played = played or set()
+    size = min(len(team_a), len(team_b))
+
+    def pick(team: List[int]) -> List[int]:
+        if len(team) == size:
+            return list(team)
+        shuffled = random.sample(team, len(team))
+        return sorted(shuffled, key=lambda p: counts.get(p, 0))[:size]
+
+    side_a = sorted(pick(team_a), key=lambda p: ratings[p])
+    side_b = sorted(pick(team_b), key=lambda p: ratings[p])
+
+    def gap(a: int, b: int) -> float:
+        return abs(ratings[a] - ratings[b])
+
+    for i in range(size):
+        if frozenset((side_a[i], side_b[i])) not in played:
+            continue
+        best_j, best_cost = None, None
+        for j in range(max(0, i - REMATCH_WINDOW), min(size, i + REMATCH_WINDOW + 1)):
+            if j == i:
+                continue
+            if frozenset((side_a[i], side_b[j])) in played or frozenset((side_a[j], side_b[i])) in played:
+                continue
+            cost = gap(side_a[i], side_b[j]) + gap(side_a[j], side_b[i]) - gap(side_a[j], side_b[j])
+            if best_cost is None or cost < best_cost:
+                best_j, best_cost = j, cost
+        if best_j is not None:
+            side_b[i], side_b[best_j] = side_b[best_j], side_b[i]
+
+    return list(zip(side_a, side_b))
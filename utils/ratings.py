@@ -0,0 +1,16 @@
+from typing import Tuple
+
+# --- ELO RATINGS ---
+# Every player starts at DEFAULT_RATING. K_FACTOR is how many points a single
+# upset between equally rated players moves.
+DEFAULT_RATING = 1000.0
+K_FACTOR = 32.0
+
+def expected_score(rating: float, opponent_rating: float) -> float:
+    """Chance (0-1) that a player with `rating` beats one with `opponent_rating`."""
+    return 1.0 / (1.0 + 10 ** ((opponent_rating - rating) / 400.0))
+
+def elo_update(winner_rating: float, loser_rating: float, k: float = K_FACTOR) -> Tuple[float, float]:
+    """Returns the new (winner, loser) ratings after a single match."""
+    change = k * (1.0 - expected_score(winner_rating, loser_rating))
+    return winner_rating + change, loser_rating - change
@@ -0,0 +1,465 @@
+import sqlite3
+import json
+import os
+import datetime
+from collections import Counter
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from .ratings import DEFAULT_RATING, elo_update
+
+# --- SHARED STATE STORE ---
+# Every bot process (single process or one worker per shard group) opens its own
+# connection to the same SQLite file. WAL mode lets readers and the single writer
+# run side by side, and busy_timeout makes writers from other processes wait
+# briefly for the lock. Calls run on the event loop, so the wait is kept short
+# enough not to stall the gateway heartbeat; past it sqlite3.OperationalError
+# ("database is locked") is raised and callers decide what to do.
+DB_FILE = 'data/state.db'
+BUSY_TIMEOUT_SECONDS = 2
+
+# Legacy JSON files, imported once into the store the first time it is opened.
+LEGACY_TOURNAMENT_FILE = 'data/tournament_data.json'
+LEGACY_AUDIT_FILE = 'data/audit_log.json'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS audit_log (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    event_type TEXT NOT NULL,
+    user_id INTEGER NOT NULL,
+    user_name TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    details TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_audit_log_event_type ON audit_log (event_type, id);
+CREATE TABLE IF NOT EXISTS audit_rollups (
+    event_type TEXT NOT NULL,
+    day TEXT NOT NULL,
+    dimension TEXT NOT NULL,
+    value TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (event_type, day, dimension, value)
+);
+CREATE TABLE IF NOT EXISTS tournament_history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL,
+    type TEXT NOT NULL,
+    started_at TEXT,
+    ended_at TEXT NOT NULL,
+    summary TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS player_stats (
+    user_id INTEGER PRIMARY KEY,
+    rating REAL NOT NULL,
+    wins INTEGER NOT NULL DEFAULT 0,
+    losses INTEGER NOT NULL DEFAULT 0,
+    tournaments INTEGER NOT NULL DEFAULT 0,
+    titles INTEGER NOT NULL DEFAULT 0,
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_player_stats_rating ON player_stats (rating);
+CREATE TABLE IF NOT EXISTS journal (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    stream TEXT NOT NULL,
+    op TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_journal_stream ON journal (stream, seq);
+CREATE TABLE IF NOT EXISTS scheduled_announcements (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    due_at REAL NOT NULL,
+    interval_seconds INTEGER,
+    title TEXT NOT NULL,
+    message TEXT NOT NULL,
+    channel_ids TEXT NOT NULL,
+    mention_role_id INTEGER,
+    created_by_id INTEGER NOT NULL,
+    created_by_name TEXT NOT NULL,
+    created_at TEXT NOT NULL
+);
+"""
+
+# Text detail values longer than this are cut before being rolled up.
+ROLLUP_VALUE_LIMIT = 100
+
+
+def _now() -> str:
+    return datetime.datetime.now(datetime.timezone.utc).isoformat()
+
+
+class StateStore:
+    """Process-safe store for tournament state, player ratings, scheduled announcements and the audit log."""
+
+    def __init__(self, path: str = DB_FILE):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # isolation_level=None: we manage transactions ourselves with BEGIN IMMEDIATE.
+        self.conn = sqlite3.connect(path, timeout=BUSY_TIMEOUT_SECONDS, isolation_level=None, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        # FULL syncs the WAL on every commit, so a change the bot has confirmed survives a host crash.
+        self.conn.execute("PRAGMA synchronous=FULL")
+        self.conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_SECONDS * 1000}")
+        self.conn.executescript(SCHEMA)
+        self._import_legacy_files()
+        if not self.get_doc("_audit_rollups_built"):
+            self.rebuild_audit_rollups()
+
+    def close(self):
+        self.conn.close()
+
+    # --- TRANSACTIONS ---
+    def transaction(self):
+        """Context manager for a write transaction that holds the lock from the start. Nesting joins the outer transaction."""
+        return _Transaction(self.conn)
+
+    def read_transaction(self):
+        """Context manager giving a consistent read view across several queries."""
+        return _Transaction(self.conn, "BEGIN")
+
+    # --- DOCUMENTS (small JSON blobs such as the live tournament) ---
+    def get_doc(self, key: str, default: Any = None) -> Any:
+        row = self.conn.execute("SELECT value FROM documents WHERE key = ?", (key,)).fetchone()
+        return json.loads(row["value"]) if row else default
+
+    def set_doc(self, key: str, value: Any):
+        with self.transaction():
+            self._put_doc(key, value)
+
+    def _put_doc(self, key: str, value: Any):
+        self.conn.execute(
+            "INSERT INTO documents (key, value, updated_at) VALUES (?, ?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value, updated_at = excluded.updated_at",
+            (key, json.dumps(value, ensure_ascii=False), _now())
+        )
+
+    # --- WRITE-AHEAD JOURNAL ---
+    # A stream's state is its last snapshot (the document under the stream's key,
+    # plus "<key>:seq", the last journal entry folded into it) followed by every
+    # journal entry after that. A mutation costs one small insert; compaction
+    # folds the entries into a new snapshot and drops them, in one transaction.
+    def journal_append(self, stream: str, op: str, payload: Dict) -> int:
+        """Appends one mutation to a stream and returns its sequence number."""
+        with self.transaction():
+            cursor = self.conn.execute(
+                "INSERT INTO journal (stream, op, payload, created_at) VALUES (?, ?, ?, ?)",
+                (stream, op, json.dumps(payload, ensure_ascii=False, separators=(',', ':')), _now())
+            )
+        return cursor.lastrowid
+
+    def journal_since(self, stream: str, seq: int) -> Iterator[Tuple[int, str, Dict]]:
+        """Yields (seq, op, payload) for every entry in the stream after `seq`, oldest first."""
+        rows = self.conn.execute("SELECT seq, op, payload FROM journal WHERE stream = ? AND seq > ? ORDER BY seq", (stream, seq))
+        for row in rows:
+            yield row["seq"], row["op"], json.loads(row["payload"])
+
+    def journal_length(self, stream: str) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM journal WHERE stream = ?", (stream,)).fetchone()[0]
+
+    def _replay(self, stream: str, default: Any, apply: Callable[[Any, str, Dict], Any]) -> Tuple[Any, int, int]:
+        state, seq = self.get_doc(stream, default), self.get_doc(f"{stream}:seq", 0)
+        replayed = 0
+        for seq, op, payload in list(self.journal_since(stream, seq)):
+            try:
+                state = apply(state, op, payload)
+            except Exception as e:
+                # One bad entry must not make the stream unloadable; skip it and keep going.
+                print(f"  [!] Skipping journal entry #{seq} ({stream}/{op}) that could not be applied: {e}")
+                continue
+            replayed += 1
+        return state, seq, replayed
+
+    def replay(self, stream: str, default: Any, apply: Callable[[Any, str, Dict], Any]) -> Any:
+        """Returns the stream's current state: its snapshot with every later journal entry applied."""
+        with self.read_transaction():
+            return self._replay(stream, default, apply)[0]
+
+    def compact_journal(self, stream: str, default: Any, apply: Callable[[Any, str, Dict], Any]) -> int:
+        """Folds the stream's journal into a new snapshot and drops the folded entries. Returns how many there were.
+
+        The snapshot is rebuilt from the store inside the write transaction, never
+        from a caller's copy, so entries appended by other processes are kept."""
+        with self.transaction():
+            state, seq, replayed = self._replay(stream, default, apply)
+            # Compare seqs rather than counting, so entries _replay skipped are dropped too.
+            if seq != self.get_doc(f"{stream}:seq", 0):
+                self._put_doc(stream, state)
+                self._put_doc(f"{stream}:seq", seq)
+                self.conn.execute("DELETE FROM journal WHERE stream = ? AND seq <= ?", (stream, seq))
+        return replayed
+
+    # --- AUDIT LOG ---
+    def append_audit(self, entry: Dict):
+        with self.transaction():
+            self._insert_audit(entry)
+
+    def _insert_audit(self, entry: Dict):
+        self.conn.execute(
+            "INSERT INTO audit_log (event_type, user_id, user_name, timestamp, details) VALUES (?, ?, ?, ?, ?)",
+            (entry["event_type"], entry["user_id"], entry["user_name"], entry["timestamp"],
+             json.dumps(entry["details"], ensure_ascii=False))
+        )
+        self._add_rollups(Counter(rollup_keys(entry)))
+
+    # --- AUDIT ROLLUPS (kept up to date by every append) ---
+    def _add_rollups(self, counts: Counter):
+        self.conn.executemany(
+            "INSERT INTO audit_rollups (event_type, day, dimension, value, count) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT(event_type, day, dimension, value) DO UPDATE SET count = count + excluded.count",
+            [(*key, n) for key, n in counts.items()]
+        )
+
+    def rebuild_audit_rollups(self):
+        """Recomputes all rollups in one streaming pass over the raw log.
+
+        Memory grows with the number of distinct rollup keys, not with the size of the log."""
+        counts = Counter()
+        with self.transaction():
+            for row in self.conn.execute("SELECT event_type, user_id, timestamp, details FROM audit_log"):
+                counts.update(rollup_keys({
+                    "event_type": row["event_type"], "user_id": row["user_id"],
+                    "timestamp": row["timestamp"], "details": json.loads(row["details"])
+                }))
+            self.conn.execute("DELETE FROM audit_rollups")
+            self._add_rollups(counts)
+            self._put_doc("_audit_rollups_built", True)
+
+    def audit_stats(self, group_by: str, event_type: Optional[str] = None, since_day: Optional[str] = None, limit: int = 15) -> List[Tuple[str, int]]:
+        """Returns (label, count) pairs, largest first, read straight from the rollups.
+
+        group_by is "event_type", "day", "user" or the name of a details key such as "enemy_guild"."""
+        if group_by == "event_type":
+            label, dimension = "event_type", "total"
+        elif group_by == "day":
+            label, dimension = "day", "total"
+        elif group_by == "user":
+            label, dimension = "value", "user"
+        else:
+            label, dimension = "value", f"detail:{group_by}"
+
+        query = f"SELECT {label} AS label, SUM(count) AS total FROM audit_rollups WHERE dimension = ?"
+        params = [dimension]
+        if event_type:
+            query += " AND event_type = ? COLLATE NOCASE"
+            params.append(event_type)
+        if since_day:
+            query += " AND day >= ?"
+            params.append(since_day)
+        query += f" GROUP BY {label} ORDER BY {'label DESC' if group_by == 'day' else 'total DESC'} LIMIT ?"
+        params.append(limit)
+        return [(row["label"], row["total"]) for row in self.conn.execute(query, params)]
+
+    def iter_audit(self, event_type: Optional[str] = None, limit: Optional[int] = None) -> Iterator[Dict]:
+        """Yields audit entries newest first, optionally filtered by event type (case-insensitive)."""
+        return iter_audit_rows(self.conn, event_type, limit)
+
+    # --- PLAYER RATINGS AND TOURNAMENT HISTORY ---
+    # A player is "rated" once they have a win or a loss. Rows created just to
+    # count tournament entries keep a placeholder rating that is never used.
+    def _ensure_player(self, user_id: int, seed: Optional[float] = None):
+        """Creates the player's row if missing; `seed` becomes their starting rating while they are still unrated."""
+        self.conn.execute(
+            "INSERT OR IGNORE INTO player_stats (user_id, rating, updated_at) VALUES (?, ?, ?)",
+            (user_id, DEFAULT_RATING if seed is None else seed, _now())
+        )
+        if seed is not None:
+            self.conn.execute("UPDATE player_stats SET rating = ? WHERE user_id = ? AND wins + losses = 0", (seed, user_id))
+
+    def record_match_result(self, winner_id: int, loser_id: int, winner_seed: float = DEFAULT_RATING, loser_seed: float = DEFAULT_RATING) -> Tuple[float, float]:
+        """Applies one match to both players' Elo ratings and win/loss counts; returns the new ratings.
+
+        The seeds are the starting ratings (e.g. from rank) used for a player's first rated match."""
+        with self.transaction():
+            self._ensure_player(winner_id, winner_seed)
+            self._ensure_player(loser_id, loser_seed)
+            winner_rating = self.conn.execute("SELECT rating FROM player_stats WHERE user_id = ?", (winner_id,)).fetchone()["rating"]
+            loser_rating = self.conn.execute("SELECT rating FROM player_stats WHERE user_id = ?", (loser_id,)).fetchone()["rating"]
+            winner_rating, loser_rating = elo_update(winner_rating, loser_rating)
+            now = _now()
+            self.conn.execute("UPDATE player_stats SET rating = ?, wins = wins + 1, updated_at = ? WHERE user_id = ?", (winner_rating, now, winner_id))
+            self.conn.execute("UPDATE player_stats SET rating = ?, losses = losses + 1, updated_at = ? WHERE user_id = ?", (loser_rating, now, loser_id))
+        return winner_rating, loser_rating
+
+    def get_player_stats(self, user_id: int) -> Optional[Dict]:
+        """Returns a player's aggregates plus their position on the rating ladder (None while unrated), or None if they have no record."""
+        row = self.conn.execute("SELECT * FROM player_stats WHERE user_id = ?", (user_id,)).fetchone()
+        if row is None:
+            return None
+        stats = dict(row)
+        stats["rank"] = None
+        if row["wins"] + row["losses"] > 0:
+            stats["rank"] = self.conn.execute(
+                "SELECT COUNT(*) + 1 FROM player_stats WHERE rating > ? AND wins + losses > 0", (row["rating"],)
+            ).fetchone()[0]
+        return stats
+
+    def get_ratings(self, user_ids: List[int]) -> Dict[int, float]:
+        """Returns the stored rating of every listed player who has played a rated match."""
+        ratings = {}
+        ids = list(user_ids)
+        # Stay well under SQLite's bound-parameter limit for large pools.
+        for i in range(0, len(ids), 500):
+            chunk = ids[i:i + 500]
+            rows = self.conn.execute(
+                f"SELECT user_id, rating FROM player_stats WHERE wins + losses > 0 AND user_id IN ({','.join('?' * len(chunk))})", chunk
+            )
+            ratings.update({row["user_id"]: row["rating"] for row in rows})
+        return ratings
+
+    def archive_tournament(self, name: str, t_type: str, started_at: Optional[str], players: List[int], winners: List[int], summary: Dict):
+        """Appends a finished tournament to the history and credits its players."""
+        with self.transaction():
+            self.conn.execute(
+                "INSERT INTO tournament_history (name, type, started_at, ended_at, summary) VALUES (?, ?, ?, ?, ?)",
+                (name, t_type, started_at, _now(), json.dumps(summary, ensure_ascii=False, separators=(',', ':')))
+            )
+            for user_id in players:
+                self._ensure_player(user_id)
+            self.conn.executemany("UPDATE player_stats SET tournaments = tournaments + 1 WHERE user_id = ?", [(p,) for p in players])
+            self.conn.executemany("UPDATE player_stats SET titles = titles + 1 WHERE user_id = ?", [(w,) for w in winners])
+
+    def iter_tournament_history(self, limit: int = 10) -> Iterator[Dict]:
+        """Yields archived tournaments, most recent first."""
+        for row in self.conn.execute("SELECT * FROM tournament_history ORDER BY id DESC LIMIT ?", (limit,)):
+            entry = dict(row)
+            entry["summary"] = json.loads(entry["summary"])
+            yield entry
+
+    # --- SCHEDULED ANNOUNCEMENTS ---
+    def add_announcement(self, due_at: float, interval_seconds: Optional[int], title: str, message: str,
+                         channel_ids: List[int], mention_role_id: Optional[int], created_by_id: int, created_by_name: str) -> int:
+        with self.transaction():
+            cursor = self.conn.execute(
+                "INSERT INTO scheduled_announcements (due_at, interval_seconds, title, message, channel_ids, mention_role_id, created_by_id, created_by_name, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (due_at, interval_seconds, title, message, json.dumps(channel_ids), mention_role_id, created_by_id, created_by_name, _now())
+            )
+        return cursor.lastrowid
+
+    def list_announcements(self) -> List[Dict]:
+        """All pending announcements, soonest first."""
+        rows = self.conn.execute("SELECT * FROM scheduled_announcements ORDER BY due_at").fetchall()
+        return [{**dict(row), "channel_ids": json.loads(row["channel_ids"])} for row in rows]
+
+    def cancel_announcement(self, announcement_id: int) -> bool:
+        with self.transaction():
+            cursor = self.conn.execute("DELETE FROM scheduled_announcements WHERE id = ?", (announcement_id,))
+        return cursor.rowcount > 0
+
+    def claim_announcement(self, announcement_id: int, due_at: float, now: float) -> Optional[Dict]:
+        """Takes ownership of one due announcement, or returns None if it was cancelled, rescheduled or already claimed.
+
+        The row must still be due at `due_at`, so two processes can never deliver the same run.
+        One-off announcements are deleted; recurring ones move to their next future run (returned as "next_due_at")."""
+        with self.transaction():
+            row = self.conn.execute("SELECT * FROM scheduled_announcements WHERE id = ? AND due_at = ?", (announcement_id, due_at)).fetchone()
+            if row is None:
+                return None
+            announcement = {**dict(row), "channel_ids": json.loads(row["channel_ids"]), "next_due_at": None}
+            if row["interval_seconds"]:
+                next_due = due_at + row["interval_seconds"]
+                if next_due <= now:
+                    # The bot was down for several runs; deliver once and skip ahead instead of replaying them all.
+                    next_due += ((now - next_due) // row["interval_seconds"] + 1) * row["interval_seconds"]
+                self.conn.execute("UPDATE scheduled_announcements SET due_at = ? WHERE id = ?", (next_due, announcement_id))
+                announcement["next_due_at"] = next_due
+            else:
+                self.conn.execute("DELETE FROM scheduled_announcements WHERE id = ?", (announcement_id,))
+        return announcement
+
+    # --- ONE-TIME MIGRATION FROM THE OLD JSON FILES ---
+    def _import_legacy_files(self):
+        with self.transaction():
+            if self.conn.execute("SELECT 1 FROM documents WHERE key = '_legacy_imported'").fetchone():
+                return
+
+            if os.path.exists(LEGACY_TOURNAMENT_FILE) and os.path.getsize(LEGACY_TOURNAMENT_FILE) > 0:
+                with open(LEGACY_TOURNAMENT_FILE, 'r', encoding='utf-8') as f:
+                    try:
+                        self._put_doc("tournament", json.load(f))
+                    except json.JSONDecodeError:
+                        pass
+
+            if os.path.exists(LEGACY_AUDIT_FILE) and os.path.getsize(LEGACY_AUDIT_FILE) > 0:
+                with open(LEGACY_AUDIT_FILE, 'r', encoding='utf-8') as f:
+                    try:
+                        logs = json.load(f)
+                    except json.JSONDecodeError:
+                        logs = []
+                # The JSON log is stored newest first; insert oldest first so ids follow time.
+                for entry in reversed(logs):
+                    self._insert_audit(entry)
+
+            self._put_doc("_legacy_imported", True)
+
+
+def open_reader(path: str = DB_FILE) -> sqlite3.Connection:
+    """A plain read-only connection, e.g. for streaming a long cursor from a worker thread.
+
+    Unlike StateStore() it runs no schema or migration step and never takes the write lock."""
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True, timeout=BUSY_TIMEOUT_SECONDS, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+def iter_audit_rows(conn: sqlite3.Connection, event_type: Optional[str] = None, limit: Optional[int] = None) -> Iterator[Dict]:
+    query = "SELECT event_type, user_id, user_name, timestamp, details FROM audit_log"
+    params = []
+    if event_type:
+        query += " WHERE event_type = ? COLLATE NOCASE"
+        params.append(event_type)
+    query += " ORDER BY id DESC"
+    if limit is not None:
+        query += " LIMIT ?"
+        params.append(limit)
+    for row in conn.execute(query, params):
+        yield {
+            "event_type": row["event_type"],
+            "user_id": row["user_id"],
+            "user_name": row["user_name"],
+            "timestamp": row["timestamp"],
+            "details": json.loads(row["details"])
+        }
+
+def rollup_keys(entry: Dict) -> List[Tuple[str, str, str, str]]:
+    """The (event_type, day, dimension, value) buckets a single audit entry counts towards."""
+    event_type, day = entry["event_type"], entry["timestamp"][:10]
+    keys = [(event_type, day, "total", ""), (event_type, day, "user", str(entry["user_id"]))]
+    for key, value in entry["details"].items():
+        # Only text details (guild names, servers, members...) make useful buckets; counts and ids don't.
+        if isinstance(value, str):
+            keys.append((event_type, day, f"detail:{key}", value[:ROLLUP_VALUE_LIMIT]))
+    return keys
+
+
+class _Transaction:
+    def __init__(self, conn: sqlite3.Connection, begin: str = "BEGIN IMMEDIATE"):
+        self.conn = conn
+        self.begin = begin
+
+    def __enter__(self):
+        # Nested transactions join the outer one, so callers can group several store writes atomically.
+        self.outer = not self.conn.in_transaction
+        if self.outer:
+            self.conn.execute(self.begin)
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.outer:
+            self.conn.execute("COMMIT" if exc_type is None else "ROLLBACK")
+        return False
+
+
+_store: Optional[StateStore] = None
+
+def get_store() -> StateStore:
+    """Returns this process's store, opening the connection on first use."""
+    global _store
+    if _store is None:
+        _store = StateStore()
+    return _store